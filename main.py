@@ -1,14 +1,37 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+import aiofiles
+import httpx
+import ormsgpack
 import yt_dlp
+import asyncio
+import copy
+import operator
 import re
 import os
+import shutil
 import tempfile
+import threading
+import time
 import uuid
+from urllib.parse import quote
 
-app = FastAPI(title="Universal Social Media Downloader API")
+from cachetools import TTLCache
+
+# orjson serializes straight to bytes in C, which matters for info
+# responses carrying dozens of format dicts
+app = FastAPI(
+    title="Universal Social Media Downloader API",
+    default_response_class=ORJSONResponse,
+)
+
+# Compress JSON responses; format lists are highly repetitive text that
+# compresses 5-10x. Small responses (and streamed video bodies, which
+# don't advertise a compressible length) are left alone.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # CORS middleware for frontend communication
 app.add_middleware(
@@ -19,8 +42,239 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Temp directory for downloads
-DOWNLOAD_DIR = tempfile.gettempdir()
+# Temp directory for downloads. A dedicated subdirectory (rather than
+# /tmp itself) so the cleanup sweeper only ever touches our own files.
+DOWNLOAD_DIR = os.path.join(tempfile.gettempdir(), "video-downloader")
+os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+
+# Downloads older than this are removed by the background sweeper
+DOWNLOAD_MAX_AGE = 900  # seconds
+
+# When running behind nginx (see nginx.conf), set X_ACCEL_PREFIX to the
+# internal location (e.g. "/_protected") so nginx serves the file via
+# sendfile(2) and the worker is freed as soon as yt-dlp finishes writing.
+X_ACCEL_PREFIX = os.environ.get("X_ACCEL_PREFIX", "")
+
+# Short-lived cache of extract_info results. Clients typically call
+# /api/info to pick a format and then /api/download right after; reusing
+# the info dict skips a second full metadata extraction (network round
+# trips + player JS parsing) on the download call.
+INFO_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+# Bounded like INFO_CACHE so locks don't accumulate per unique URL
+# forever. If a lock is evicted while held, a concurrent request for the
+# same URL may extract redundantly — wasteful but harmless.
+_INFO_LOCKS: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+
+def _info_lock(url: str) -> asyncio.Lock:
+    """Get (or create) the per-URL lock guarding cache fills."""
+    return _INFO_LOCKS.setdefault(url, asyncio.Lock())
+
+
+# Long-lived YoutubeDL instances keyed by (frozen) options, so extractor
+# state, the player-JS cache and HTTP connections are reused across
+# requests instead of being rebuilt per call. Each instance is guarded by
+# a lock (YoutubeDL is not safe for concurrent use); the pool grows one
+# instance per key as needed when all existing ones are busy.
+_YDL_POOL: dict[tuple, list[tuple[yt_dlp.YoutubeDL, threading.Lock]]] = {}
+_YDL_POOL_LOCK = threading.Lock()
+
+
+def _freeze_value(value):
+    """Recursively convert an options value into something hashable."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze_value(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze_value(v)) for k, v in value.items()))
+    hash(value)  # unsupported option type: fail here, not deep in the pool
+    return value
+
+
+def _freeze_opts(opts: dict) -> tuple:
+    return tuple(sorted((k, _freeze_value(v)) for k, v in opts.items()))
+
+
+def _acquire_ydl(opts: dict) -> tuple[yt_dlp.YoutubeDL, threading.Lock]:
+    """Get a free pooled YoutubeDL for these options, with its lock held."""
+    key = _freeze_opts(opts)
+    with _YDL_POOL_LOCK:
+        pool = _YDL_POOL.setdefault(key, [])
+        for ydl, lock in pool:
+            if lock.acquire(blocking=False):
+                return ydl, lock
+        lock = threading.Lock()
+        lock.acquire()
+        # Private copy: YoutubeDL mutates the params dict it keeps, and the
+        # caller's dict doubles as our pool key
+        ydl = yt_dlp.YoutubeDL(dict(opts))
+        pool.append((ydl, lock))
+        return ydl, lock
+
+
+def _extract(url: str, opts: dict, download: bool, cached_info: dict | None = None):
+    """Blocking yt-dlp extraction; run via asyncio.to_thread, never on the loop."""
+    if download:
+        # Download options carry a per-request outtmpl, so pooling buys
+        # nothing here; use a throwaway instance (on a private copy, since
+        # YoutubeDL mutates its params dict).
+        with yt_dlp.YoutubeDL(dict(opts)) as ydl:
+            return _run_extract(ydl, url, True, cached_info)
+
+    ydl, lock = _acquire_ydl(opts)
+    try:
+        return _run_extract(ydl, url, False, cached_info)
+    finally:
+        lock.release()
+
+
+def _find_direct_format(info: dict, format_id: str) -> dict | None:
+    """Return the requested format if it is a plain HTTP(S) file we can proxy."""
+    if "+" in format_id:  # merged formats need ffmpeg, so a local download
+        return None
+    for f in info.get("formats", []):
+        if f.get("format_id") == format_id:
+            if f.get("url") and f.get("protocol", "https") in ("http", "https"):
+                return f
+            return None
+    return None
+
+
+async def _proxy_direct(fmt: dict, filename: str, range_header: str | None):
+    """Stream a direct CDN URL through to the client without touching disk."""
+    req_headers = dict(fmt.get("http_headers") or {})
+    if range_header:
+        req_headers["Range"] = range_header
+
+    upstream = await _http_client.send(
+        _http_client.build_request("GET", fmt["url"], headers=req_headers),
+        stream=True,
+    )
+    if upstream.status_code >= 400:
+        await upstream.aclose()
+        return None
+
+    headers = {"Content-Disposition": content_disposition(filename)}
+    for name in ("content-length", "content-range", "accept-ranges"):
+        if name in upstream.headers:
+            headers[name] = upstream.headers[name]
+
+    # Bounded queue between the CDN read and the client write: the producer
+    # blocks when the client is slow, capping buffered data at 8 x 64 KiB
+    # per request instead of letting upstream bytes pile up in RAM.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+    eof = object()
+
+    async def producer():
+        try:
+            async for chunk in upstream.aiter_bytes(1 << 16):
+                await queue.put(chunk)
+            await queue.put(eof)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await queue.put(exc)
+
+    async def relay():
+        producer_task = asyncio.create_task(producer())
+        try:
+            while True:
+                item = await queue.get()
+                if item is eof:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # A client disconnect cancels this generator; stop pulling from
+            # the CDN too instead of downloading into the void.
+            producer_task.cancel()
+            await upstream.aclose()
+
+    return StreamingResponse(
+        relay(),
+        status_code=upstream.status_code,
+        media_type=upstream.headers.get("content-type", "video/mp4"),
+        headers=headers,
+    )
+
+
+def _run_extract(ydl: yt_dlp.YoutubeDL, url: str, download: bool, cached_info: dict | None):
+    if cached_info is not None:
+        info = ydl.process_ie_result(copy.deepcopy(cached_info), download=download)
+    else:
+        info = ydl.extract_info(url, download=download)
+    if download and info is not None:
+        # yt-dlp knows the exact output path; record it so the endpoint
+        # doesn't have to scan the download directory.
+        info["_filepath"] = (
+            info.get("requested_downloads", [{}])[0].get("filepath")
+            or ydl.prepare_filename(info)
+        )
+    return info
+
+
+# Shared client for proxying direct CDN URLs; created on startup so it
+# lives on the running event loop
+_http_client: httpx.AsyncClient | None = None
+
+
+@app.on_event("startup")
+async def _create_http_client():
+    global _http_client
+    _http_client = httpx.AsyncClient(follow_redirects=True, timeout=httpx.Timeout(30.0))
+
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    if _http_client is not None:
+        await _http_client.aclose()
+
+
+def _sweep_downloads() -> None:
+    """Delete download subdirectories older than DOWNLOAD_MAX_AGE."""
+    cutoff = time.time() - DOWNLOAD_MAX_AGE
+    # scandir gives mtime from the directory entry without a second stat
+    for entry in os.scandir(DOWNLOAD_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                if entry.is_dir():
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.unlink(entry.path)
+        except OSError:
+            continue  # already gone or busy; retry next sweep
+
+
+async def _cleanup_loop() -> None:
+    while True:
+        await asyncio.sleep(60)
+        await asyncio.to_thread(_sweep_downloads)
+
+
+# Strong reference to the sweeper task: asyncio only keeps weak refs to
+# tasks, so an unreferenced task can be garbage-collected mid-flight
+_cleanup_task: asyncio.Task | None = None
+
+
+@app.on_event("startup")
+async def _start_cleanup():
+    # Downloads used to accumulate in /tmp forever; sweep them periodically
+    global _cleanup_task
+    _cleanup_task = asyncio.create_task(_cleanup_loop())
+
+
+@app.on_event("startup")
+async def _configure_thread_pool():
+    # yt-dlp calls are offloaded with asyncio.to_thread; widen the default
+    # executor so concurrent extractions don't queue behind each other.
+    from concurrent.futures import ThreadPoolExecutor
+
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=64, thread_name_prefix="ydl")
+    )
 
 
 class DownloadRequest(BaseModel):
@@ -31,6 +285,7 @@ class FormatInfo(BaseModel):
     format_id: str
     ext: str
     resolution: str
+    height: int = 0
     filesize: int | None = None
     filesize_approx: int | None = None
     has_audio: bool = True
@@ -50,52 +305,101 @@ class DownloadByFormatRequest(BaseModel):
     format_id: str
 
 
+class BatchInfoRequest(BaseModel):
+    urls: list[str]
+
+
+class BatchInfoResult(BaseModel):
+    url: str
+    info: VideoInfoResponse | None = None
+    error: str | None = None
+
+
+# Single alternation with named groups: one C-level search identifies the
+# platform instead of compiling and trying five patterns per request.
+_PLATFORM_RE = re.compile(
+    r"(?P<youtube>youtube\.com|youtu\.be)"
+    r"|(?P<tiktok>tiktok\.com)"
+    r"|(?P<instagram>instagram\.com)"
+    r"|(?P<facebook>facebook\.com|fb\.watch)"
+    r"|(?P<twitter>twitter\.com|x\.com)",
+    re.IGNORECASE,
+)
+
+
 def detect_platform(url: str) -> str:
     """Detect the social media platform from the URL."""
-    patterns = {
-        "youtube": r"(youtube\.com|youtu\.be)",
-        "tiktok": r"tiktok\.com",
-        "instagram": r"instagram\.com",
-        "facebook": r"(facebook\.com|fb\.watch)",
-        "twitter": r"(twitter\.com|x\.com)",
-    }
-    for platform, pattern in patterns.items():
-        if re.search(pattern, url, re.IGNORECASE):
-            return platform
-    return "unknown"
+    m = _PLATFORM_RE.search(url)
+    return m.lastgroup if m else "unknown"
+
+
+_BASE_YDL_OPTS = {
+    "noplaylist": True,
+    "quiet": True,
+    "no_warnings": True,
+    "extract_flat": False,
+    # Persistent cache dir so the player-JS decipher cache survives
+    # across instances and restarts
+    "cachedir": os.path.join(tempfile.gettempdir(), "yt-dlp-cache"),
+}
+
+_PLATFORM_YDL_EXTRAS = {
+    # TikTok-specific: try to get no-watermark version
+    "tiktok": {"format_sort": ["res", "ext:mp4:m4a"]},
+}
+
+# One options dict per platform, built at import. Returned as a shallow
+# copy per call: YoutubeDL keeps the dict it is given and mutates it in
+# place, so handing out the shared dict would corrupt it after one use.
+_OPTS_BY_PLATFORM = {
+    platform: {**_BASE_YDL_OPTS, **_PLATFORM_YDL_EXTRAS.get(platform, {})}
+    for platform in ("youtube", "tiktok", "instagram", "facebook", "twitter")
+}
 
 
 def get_yt_dlp_options(platform: str) -> dict:
     """Get platform-specific yt-dlp options."""
-    base_options = {
-        "noplaylist": True,
-        "quiet": True,
-        "no_warnings": True,
-        "extract_flat": False,
-    }
+    return dict(_OPTS_BY_PLATFORM.get(platform, _BASE_YDL_OPTS))
 
-    # TikTok-specific: try to get no-watermark version
-    if platform == "tiktok":
-        base_options["format_sort"] = ["res", "ext:mp4:m4a"]
 
-    return base_options
+async def file_iterator(path: str, chunk_size: int = 1 << 20):
+    """Yield a file in fixed-size chunks so responses stream instead of buffering."""
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+
+# Translation table for sanitize_filename, built once at import
+_SANITIZE_TABLE = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
+# Codec values meaning "absent" in yt-dlp format dicts
+_NO_CODEC = (None, "none")
 
 
 def sanitize_filename(filename: str) -> str:
     """Remove invalid characters from filename."""
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, "_")
-    return filename[:100]  # Limit length
+    return filename.translate(_SANITIZE_TABLE)[:100]  # Limit length
 
 
-@app.post("/api/info", response_model=VideoInfoResponse)
-async def get_video_info(request: DownloadRequest):
-    """
-    Get video information with all available formats/resolutions.
+def content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition header value.
+
+    Headers are latin-1 only, so non-ASCII titles (CJK, emoji) must be
+    percent-encoded via RFC 5987 filename* or the response 500s.
     """
-    url = request.url.strip()
+    try:
+        filename.encode("latin-1")
+    except UnicodeEncodeError:
+        return f"attachment; filename*=utf-8''{quote(filename)}"
+    return f'attachment; filename="{filename}"'
 
+
+async def _video_info(url: str) -> VideoInfoResponse:
+    """Fetch metadata for one URL and build the info response.
+
+    Shared by /api/info and /api/info/batch; failures surface as
+    HTTPException.
+    """
     if not url:
         raise HTTPException(status_code=400, detail="URL is required")
 
@@ -110,76 +414,82 @@ async def get_video_info(request: DownloadRequest):
     ydl_opts = get_yt_dlp_options(platform)
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-
+        # Lock per URL so concurrent requests for the same video trigger a
+        # single extraction, and /api/download can reuse the result.
+        async with _info_lock(url):
+            info = INFO_CACHE.get(url)
             if info is None:
-                raise HTTPException(status_code=404, detail="Could not extract video information")
-
-            # Extract available formats
-            formats_list = []
-            seen_resolutions = set()
-            
-            raw_formats = info.get("formats", [])
+                info = await asyncio.to_thread(_extract, url, ydl_opts, False)
+                if info is not None:
+                    INFO_CACHE[url] = info
+
+        if info is None:
+            raise HTTPException(status_code=404, detail="Could not extract video information")
+
+        # Extract available formats
+        formats_list = []
+        # (resolution, ext, has_audio) -> index into formats_list, used to
+        # dedup while keeping the larger-filesize variant of each entry
+        seen_keys: dict[tuple, int] = {}
+        
+        raw_formats = info.get("formats", [])
+        
+        for f in raw_formats:
+            # Bind the lookup once; this loop runs 40+ times on format-rich
+            # videos and every f.get is a dict lookup
+            get = f.get
+
+            # Skip formats without URL, then audio-only ones
+            if not get("url"):
+                continue
+            if get("vcodec") in _NO_CODEC:
+                continue
+
+            has_audio = get("acodec") not in _NO_CODEC
+            ext = get("ext", "")
+            height = get("height")
+            width = get("width")
+            format_id = get("format_id", "")
+
+            # Build resolution string
+            if height:
+                resolution = f"{width}x{height}" if width else f"{height}p"
+            else:
+                resolution = get("format_note", "unknown")
             
-            for f in raw_formats:
-                ext = f.get("ext", "")
-                height = f.get("height")
-                width = f.get("width")
-                format_id = f.get("format_id", "")
-                video_url = f.get("url")
-                
-                # Skip formats without URL or video
-                if not video_url:
-                    continue
-                
-                # Check if has video and audio
-                vcodec = f.get("vcodec", "none")
-                acodec = f.get("acodec", "none")
-                has_video = vcodec != "none" and vcodec is not None
-                has_audio = acodec != "none" and acodec is not None
-                
-                # Skip audio-only for now
-                if not has_video:
-                    continue
-                
-                # Build resolution string
-                if height:
-                    resolution = f"{height}p"
-                    if width:
-                        resolution = f"{width}x{height}"
-                else:
-                    resolution = f.get("format_note", "unknown")
-                
-                # Create unique key to avoid duplicates
-                res_key = f"{resolution}_{ext}_{has_audio}"
-                if res_key in seen_resolutions:
-                    continue
-                seen_resolutions.add(res_key)
-                
-                formats_list.append(FormatInfo(
-                    format_id=format_id,
-                    ext=ext,
-                    resolution=resolution,
-                    filesize=f.get("filesize"),
-                    filesize_approx=f.get("filesize_approx"),
-                    has_audio=has_audio,
-                    has_video=has_video,
-                ))
-            
-            # Sort by resolution (height) descending
-            formats_list.sort(
-                key=lambda x: int(x.resolution.replace("p", "").split("x")[-1]) if x.resolution.replace("p", "").split("x")[-1].isdigit() else 0,
-                reverse=True
+            # model_construct skips pydantic validation; safe because every
+            # field is populated explicitly right here
+            fmt = FormatInfo.model_construct(
+                format_id=format_id,
+                ext=ext,
+                resolution=resolution,
+                height=height or 0,
+                filesize=get("filesize"),
+                filesize_approx=get("filesize_approx"),
+                has_audio=has_audio,
+                has_video=True,
             )
 
-            return VideoInfoResponse(
-                title=info.get("title", "Untitled"),
-                platform=platform,
-                thumbnail=info.get("thumbnail"),
-                duration=info.get("duration"),
-                formats=formats_list,
-            )
+            res_key = (resolution, ext, has_audio)
+            existing = seen_keys.get(res_key)
+            if existing is None:
+                seen_keys[res_key] = len(formats_list)
+                formats_list.append(fmt)
+            elif (fmt.filesize or fmt.filesize_approx or 0) > (
+                formats_list[existing].filesize or formats_list[existing].filesize_approx or 0
+            ):
+                formats_list[existing] = fmt
+        
+        # Sort by resolution (height) descending
+        formats_list.sort(key=operator.attrgetter("height"), reverse=True)
+
+        return VideoInfoResponse(
+            title=info.get("title", "Untitled"),
+            platform=platform,
+            thumbnail=info.get("thumbnail"),
+            duration=info.get("duration"),
+            formats=formats_list,
+        )
 
     except yt_dlp.utils.DownloadError as e:
         error_msg = str(e).lower()
@@ -195,11 +505,81 @@ async def get_video_info(request: DownloadRequest):
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 
+def _wants_msgpack(raw_request: Request) -> bool:
+    return "application/msgpack" in raw_request.headers.get("accept", "")
+
+
+def _msgpack_response(payload) -> Response:
+    """Pack a model (or list of models) as a MessagePack response."""
+    if isinstance(payload, list):
+        data = [item.model_dump() for item in payload]
+    else:
+        data = payload.model_dump()
+    return Response(ormsgpack.packb(data), media_type="application/msgpack")
+
+
+@app.post("/api/info", response_model=VideoInfoResponse)
+async def get_video_info(request: DownloadRequest, raw_request: Request):
+    """
+    Get video information with all available formats/resolutions.
+    Sends MessagePack instead of JSON when the Accept header asks for
+    application/msgpack.
+    """
+    payload = await _video_info(request.url.strip())
+    if _wants_msgpack(raw_request):
+        return _msgpack_response(payload)
+    return payload
+
+
+# Bounds concurrent batch extractions so one request can't hammer the
+# source platforms (and get us rate-limited)
+_BATCH_SEMAPHORE = asyncio.Semaphore(8)
+
+MAX_BATCH_URLS = 50
+
+
+@app.post("/api/info/batch", response_model=list[BatchInfoResult])
+async def get_video_info_batch(request: BatchInfoRequest, raw_request: Request):
+    """
+    Get video information for multiple URLs concurrently.
+    Per-URL failures are reported inline instead of failing the batch.
+    Supports MessagePack via the Accept header like /api/info.
+    """
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="urls is required")
+    if len(request.urls) > MAX_BATCH_URLS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_URLS} urls per batch"
+        )
+
+    async def one(u: str) -> VideoInfoResponse:
+        async with _BATCH_SEMAPHORE:
+            return await _video_info(u.strip())
+
+    results = await asyncio.gather(
+        *(one(u) for u in request.urls), return_exceptions=True
+    )
+
+    response = []
+    for u, result in zip(request.urls, results):
+        if isinstance(result, HTTPException):
+            response.append(BatchInfoResult(url=u, error=result.detail))
+        elif isinstance(result, BaseException):
+            response.append(BatchInfoResult(url=u, error=str(result)))
+        else:
+            response.append(BatchInfoResult(url=u, info=result))
+
+    if _wants_msgpack(raw_request):
+        return _msgpack_response(response)
+    return response
+
+
 @app.post("/api/download")
-async def download_video(request: DownloadByFormatRequest):
+async def download_video(request: DownloadByFormatRequest, raw_request: Request):
     """
     Download video with selected format/resolution.
-    Downloads via yt-dlp and returns the file.
+    Proxies direct CDN formats straight through; otherwise downloads via
+    yt-dlp and returns the file.
     """
     url = request.url.strip()
     format_id = request.format_id.strip()
@@ -215,9 +595,41 @@ async def download_video(request: DownloadByFormatRequest):
             detail="Unsupported platform",
         )
 
-    # Generate unique filename
+    # Fast path: if the requested format is a plain HTTP(S) file, stream it
+    # straight from the CDN — no disk write, no /tmp usage, no cleanup.
+    # Falls back to a regular yt-dlp download on any miss or upstream error.
+    info = INFO_CACHE.get(url)
+    if info is None:
+        try:
+            async with _info_lock(url):
+                info = INFO_CACHE.get(url)
+                if info is None:
+                    info = await asyncio.to_thread(
+                        _extract, url, get_yt_dlp_options(platform), False
+                    )
+                    if info is not None:
+                        INFO_CACHE[url] = info
+        except yt_dlp.utils.DownloadError:
+            info = None
+    if info is not None:
+        fmt = _find_direct_format(info, format_id)
+        if fmt is not None:
+            title = sanitize_filename(info.get("title", "video"))
+            ext = fmt.get("ext") or info.get("ext", "mp4")
+            try:
+                response = await _proxy_direct(
+                    fmt, f"{title}.{ext}", raw_request.headers.get("range")
+                )
+            except httpx.HTTPError:
+                # Connect/timeout failures fall back to a local download,
+                # same as an upstream error status
+                response = None
+            if response is not None:
+                return response
+
+    # Each download gets its own subdirectory so cleanup is a single rmtree
     unique_id = str(uuid.uuid4())[:8]
-    output_template = os.path.join(DOWNLOAD_DIR, f"{unique_id}_%(title)s.%(ext)s")
+    output_template = os.path.join(DOWNLOAD_DIR, unique_id, "%(title)s.%(ext)s")
 
     ydl_opts = {
         "format": format_id,
@@ -228,34 +640,52 @@ async def download_video(request: DownloadByFormatRequest):
     }
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-
-            if info is None:
-                raise HTTPException(status_code=404, detail="Could not extract video information")
+        # Reuse the info dict from a recent /api/info call when we have one,
+        # skipping a second full extraction; either way the blocking yt-dlp
+        # work runs in the thread pool, not on the event loop.
+        info = await asyncio.to_thread(
+            _extract, url, ydl_opts, True, INFO_CACHE.get(url)
+        )
 
-            # Get the downloaded file path
-            title = sanitize_filename(info.get("title", "video"))
-            ext = info.get("ext", "mp4")
-            
-            # Find the downloaded file
-            downloaded_file = None
-            for f in os.listdir(DOWNLOAD_DIR):
-                if f.startswith(unique_id):
-                    downloaded_file = os.path.join(DOWNLOAD_DIR, f)
-                    break
-            
-            if not downloaded_file or not os.path.exists(downloaded_file):
-                raise HTTPException(status_code=404, detail="Downloaded file not found")
-
-            # Return file for download
-            return FileResponse(
-                path=downloaded_file,
-                filename=f"{title}.{ext}",
-                media_type="video/mp4",
-                background=None,  # Don't delete immediately
+        if info is None:
+            raise HTTPException(status_code=404, detail="Could not extract video information")
+
+        # Get the downloaded file path
+        title = sanitize_filename(info.get("title", "video"))
+        ext = info.get("ext", "mp4")
+        
+        downloaded_file = info.get("_filepath")
+
+        if not downloaded_file or not os.path.exists(downloaded_file):
+            raise HTTPException(status_code=404, detail="Downloaded file not found")
+
+        # Behind nginx, hand the file off via X-Accel-Redirect so nginx
+        # does the sendfile and the worker is released immediately.
+        # A bare Response is required here: FileResponse would keep the
+        # worker busy serving the body anyway.
+        if X_ACCEL_PREFIX:
+            return Response(
+                status_code=200,
+                headers={
+                    # quote() the path: nginx unescapes the URI, and raw
+                    # titles can carry %, ?, or non-latin-1 characters
+                    "X-Accel-Redirect": f"{X_ACCEL_PREFIX}/{quote(os.path.relpath(downloaded_file, DOWNLOAD_DIR))}",
+                    "Content-Disposition": content_disposition(f"{title}.{ext}"),
+                    "Content-Type": "video/mp4",
+                },
             )
 
+        # Stream the file in 1 MiB chunks so peak memory stays at one chunk
+        # and the client download overlaps with the disk read
+        return StreamingResponse(
+            file_iterator(downloaded_file),
+            media_type="video/mp4",
+            headers={
+                "Content-Disposition": content_disposition(f"{title}.{ext}"),
+                "Content-Length": str(os.path.getsize(downloaded_file)),
+            },
+        )
+
     except yt_dlp.utils.DownloadError as e:
         raise HTTPException(status_code=400, detail=f"Failed to download: {str(e)}")
     except Exception as e: